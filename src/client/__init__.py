@@ -1,4 +1,6 @@
+from .async_client import AsyncJobClient
+from .circuit_breaker import CircuitOpenError
 from .client import JobClient
 from .dummy_client import DummyJobClient
 
-__all__ = ["JobClient", "DummyJobClient"]
+__all__ = ["JobClient", "AsyncJobClient", "DummyJobClient", "CircuitOpenError"]
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+
+from .client import ACCEPT_HEADER, job_mapping
+from .retry import JobAttempts, check_response
+
+
+class AsyncJobClient:
+    """
+    Asynchronous counterpart of JobClient, built on httpx.
+
+    A single instance keeps an HTTP/2 connection pool open, so many jobs can
+    share it concurrently (e.g. through asyncio.gather). The pool is bound to
+    the event loop it is first used in: create one client per loop and release
+    it with `aclose()` or `async with`.
+    """
+
+    def __init__(
+        self,
+        server_url,
+        job_type,
+        max_timeout=600,
+        connect_timeout=5,
+        read_timeout=600,
+    ):
+        assert job_type in job_mapping, f"Invalid job type: {job_type}"
+        self.job_class = job_mapping[job_type]
+        self.job_type = job_type
+        self.server_url = server_url
+        # End-to-end budget for a job, shared by all of its attempts
+        self.max_timeout = max_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers={"Accept": ACCEPT_HEADER},
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def run_job(self, input_data, retry=3):
+        attempts = JobAttempts(self, retry)
+        # Process the inputs off the event loop, encoding images is CPU bound
+        files, form_data = await asyncio.to_thread(
+            self.job_class.process_inputs, input_data=input_data
+        )
+
+        while attempts.attempt < retry:
+            try:
+                # Send the request
+                with attempts.send() as (connect_timeout, read_timeout):
+                    response = await self.client.post(
+                        f"{self.server_url}/run_job",
+                        files=files,
+                        data=form_data,
+                        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                    )
+
+                    # Check for response error
+                    check_response(response=response)
+
+                    # Process the response
+                    result_img = await asyncio.to_thread(
+                        self.job_class.process_outputs, response=response
+                    )
+                attempts.succeeded()
+                return result_img
+            except Exception as e:
+                delay = attempts.failed(e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    async def _check_health(self):
+        try:
+            response = await self.client.get(
+                f"{self.server_url}/health",
+                timeout=httpx.Timeout(5, connect=self.connect_timeout),
+            )
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
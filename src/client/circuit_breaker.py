@@ -0,0 +1,93 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Custom exception raised when a call is rejected by an open circuit."""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+    def __str__(self):
+        return f"CircuitOpenError: {self.message}"
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker guarding calls to a single backend.
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    call is rejected for `cooldown_s` seconds. Once the cooldown is over the
+    circuit is half-open: the next call goes through as a probe while the
+    others are still rejected, and its outcome either closes the circuit again
+    or re-opens it for another cooldown.
+    """
+
+    def __init__(self, name, failure_threshold=5, cooldown_s=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        # Set while the single half-open probe call is in flight
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def before(self):
+        """
+        Check that a call may be issued.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and still cooling down, or
+                half-open with its probe call still in flight
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN:
+                if self.probing:
+                    raise CircuitOpenError(
+                        f"Circuit for {self.name} is half-open, probe in flight"
+                    )
+                self.probing = True
+                return
+            remaining = self.opened_at + self.cooldown_s - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"Circuit for {self.name} is open, retry in {remaining:.1f}s"
+                )
+            self.state = HALF_OPEN
+            self.probing = True
+
+    def record(self, success):
+        """
+        Record the outcome of a call.
+
+        Args:
+            success (bool): Whether the backend handled the call
+        """
+        with self._lock:
+            self.probing = False
+            if success:
+                self.state = CLOSED
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """
+        Forget a call whose outcome is unknown (e.g. cancelled), so it does not
+        hold the half-open probe slot.
+        """
+        with self._lock:
+            self.probing = False
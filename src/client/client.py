@@ -1,7 +1,7 @@
 import time
 
 import requests
-from loguru import logger
+from requests.adapters import HTTPAdapter
 
 from .jobs import (
     FaceJob,
@@ -11,6 +11,7 @@ from .jobs import (
     RetouchJob,
     TryOnJob,
 )
+from .retry import JobAttempts, check_response
 
 job_mapping = {
     "face_job": FaceJob,
@@ -21,68 +22,84 @@ job_mapping = {
     "tryon_job": TryOnJob,
 }
 
+# Prefer raw image bodies, the JSON + base64 envelope is kept as a fallback
+ACCEPT_HEADER = "image/*, application/json;q=0.5"
+
 
 class JobClient:
-    def __init__(self, server_url, job_type, max_timeout=600):
+    def __init__(
+        self,
+        server_url,
+        job_type,
+        max_timeout=600,
+        connect_timeout=5,
+        read_timeout=600,
+    ):
         assert job_type in job_mapping, f"Invalid job type: {job_type}"
         self.job_class = job_mapping[job_type]
         self.job_type = job_type
         self.server_url = server_url
+        # End-to-end budget for a job, shared by all of its attempts
         self.max_timeout = max_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Keep-alive pool so consecutive jobs and retries reuse the same connection
+        self.session = requests.Session()
+        self.session.headers["Accept"] = ACCEPT_HEADER
+        self.session.mount(
+            server_url,
+            HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.session.close()
 
     def run_job(self, input_data, retry=3):
-        start = time.time()
+        attempts = JobAttempts(self, retry)
         # Process the inputs
         files, form_data = self.job_class.process_inputs(input_data=input_data)
 
-        attempt = 0
-        while attempt < retry:
+        while attempts.attempt < retry:
+            response = None
             try:
                 # Send the request
-                logger.info(f"Sending request... Attempt {attempt + 1}")
-                response = requests.post(
-                    url=f"{self.server_url}/run_job",
-                    files=files,
-                    data=form_data,
-                    timeout=600,
-                )
+                with attempts.send() as (connect_timeout, read_timeout):
+                    response = self.session.post(
+                        url=f"{self.server_url}/run_job",
+                        files=files,
+                        data=form_data,
+                        stream=True,
+                        timeout=(connect_timeout, read_timeout),
+                    )
 
-                # Check for response error
-                self._check_response(response=response)
+                    # Check for response error
+                    check_response(response=response)
 
-                # Process the response
-                result_img = self.job_class.process_outputs(response=response)
-                logger.info(f"Time taken to run the job: {time.time() - start}")
+                    # Process the response, the body is only read here
+                    result_img = self.job_class.process_outputs(response=response)
+                attempts.succeeded()
                 return result_img
             except Exception as e:
-                logger.error(f"Attempt {attempt + 1} failed: {e}")
-                attempt += 1
-                if attempt < retry:
-                    logger.info("Retrying...")
-                    time.sleep(2)  # Wait for 2 seconds before retrying
-                else:
-                    logger.error("All retry attempts failed.")
+                delay = attempts.failed(e)
+                if delay is None:
                     raise
+                time.sleep(delay)
+            finally:
+                # Streamed responses hold their connection until closed
+                if response is not None:
+                    response.close()
 
     def _check_health(self):
         try:
-            response = requests.get(f"{self.server_url}/health", timeout=5)
+            response = self.session.get(
+                f"{self.server_url}/health", timeout=(self.connect_timeout, 5)
+            )
             return response.status_code == 200
         except:
             return False
-
-    def _check_response(self, response):
-        # Check response status
-        if response.status_code != 200:
-            # Try to parse response as JSON
-            try:
-                error_data = response.json()
-                logger.error(f"\nError: {error_data.get('error', 'Unknown error')}")
-
-                # Print the stack trace if available
-                if "stack_trace" in error_data:
-                    logger.error("\n--- Server Stack Trace ---")
-                    logger.error(error_data["stack_trace"])
-            except:
-                # If not JSON, print raw response
-                logger.error(f"\nRaw server response: {response.text}")
@@ -2,7 +2,8 @@ import random
 import time
 
 from loguru import logger
-from PIL import Image
+
+from .helpers import backoff_delay, open_image
 
 fake_data = {
     "model_generation_job": "data/model.webp",
@@ -17,10 +18,26 @@ fake_time_waiting = {
 
 
 class DummyJobClient:
-    def __init__(self, server_url, job_type, max_timeout=600):
+    def __init__(
+        self,
+        server_url,
+        job_type,
+        max_timeout=600,
+        connect_timeout=5,
+        read_timeout=600,
+    ):
         assert job_type in fake_data, f"Invalid job type: {job_type}"
         self.job_type = job_type
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        pass
+
     def run_job(self, input_data, retry=3):
         start = time.time()
         # Process the inputs
@@ -28,7 +45,7 @@ class DummyJobClient:
         while attempt < retry:
             try:
                 # Send the request
-                logger.info(f"Sending request... Attempt {attempt + 1}")
+                logger.info("Sending request... Attempt {}", attempt + 1)
                 time_to_wait = fake_time_waiting[self.job_type] * random.uniform(
                     0.5, 1.5
                 )
@@ -37,15 +54,18 @@ class DummyJobClient:
                     raise Exception("Failed to run the job")
                 time.sleep(time_to_wait)
                 # Process the response
-                result_img = Image.open(fake_data[self.job_type])
-                logger.info(f"Time taken to run the job: {time.time() - start}")
+                with open(fake_data[self.job_type], "rb") as f:
+                    result_img = open_image(f.read())
+                logger.opt(lazy=True).info(
+                    "Time taken to run the job: {}", lambda: time.time() - start
+                )
                 return result_img
             except Exception as e:
-                logger.error(f"Attempt {attempt + 1} failed: {e}")
+                logger.error("Attempt {} failed: {}", attempt + 1, e)
                 attempt += 1
                 if attempt < retry:
                     logger.info("Retrying...")
-                    time.sleep(2)  # Wait for 2 seconds before retrying
+                    time.sleep(backoff_delay(attempt - 1))
                 else:
                     logger.error("All retry attempts failed.")
                     raise
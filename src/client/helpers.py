@@ -1,9 +1,79 @@
 import base64
 import io
 import os
+import random
+import re
 
 import numpy as np
-from PIL import Image
+from loguru import logger
+from PIL import Image, features
+
+# JPEG encode/decode sits on every job's critical path, and the SIMD kernels
+# of libjpeg-turbo are several times faster than plain libjpeg.
+if not features.check_feature("libjpeg_turbo"):
+    logger.warning(
+        "Pillow is not linked against libjpeg-turbo, JPEG encoding and decoding "
+        "will be slow. Install a Pillow build that bundles it (e.g. the PyPI wheels)."
+    )
+
+
+# Largest width/height a WebP image can have
+WEBP_MAX_DIMENSION = 16383
+
+
+def encode_lossless(image):
+    """
+    Encode a PIL Image losslessly, favouring encoding speed.
+
+    Args:
+        image: PIL.Image to encode
+    Returns:
+        bytes: Bit-exact WebP lossless bytes at the fastest effort setting, or
+        PNG bytes for modes and sizes WebP cannot hold as-is. The colour
+        profile and EXIF data are kept.
+    """
+    byte_arr = io.BytesIO()
+    # The WebP writer only embeds the colour profile and EXIF when given them
+    metadata = {
+        key: image.info[key] for key in ("icc_profile", "exif") if image.info.get(key)
+    }
+    if image.mode in ("RGB", "RGBA") and max(image.size) <= WEBP_MAX_DIMENSION:
+        # exact=True keeps the RGB values under fully transparent pixels
+        image.save(
+            byte_arr,
+            format="WEBP",
+            lossless=True,
+            exact=True,
+            method=0,
+            quality=0,
+            **metadata,
+        )
+    else:
+        image.save(byte_arr, format="PNG", **metadata)
+    return byte_arr.getvalue()
+
+
+def guess_image_format(image_bytes):
+    """
+    Guess the format of encoded image bytes from their magic number.
+
+    Args:
+        image_bytes (bytes): Encoded image
+    Returns:
+        str: Lowercase format name, usable as file extension and mimetype
+        subtype, or None when the format is not recognised.
+    """
+    if image_bytes[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if image_bytes[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "webp"
+    if image_bytes[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    if image_bytes[:4] == b"GIF8":
+        return "gif"
+    return None
 
 
 def rgba_to_rgb_white_background(img):
@@ -19,14 +89,12 @@ def rgba_to_rgb_white_background(img):
     if img.mode != "RGBA":
         return img
 
-    # Create white background image
-    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
-
-    # Composite input image over white background
-    composite = Image.alpha_composite(background, img)
+    # Create white RGB background image
+    background = Image.new("RGB", img.size, (255, 255, 255))
 
-    # Convert to RGB
-    return composite.convert("RGB")
+    # Blend input image over white background, using alpha as the mask
+    background.paste(img, mask=img.getchannel("A"))
+    return background
 
 
 class ImageConverter:
@@ -51,17 +119,17 @@ class ImageConverter:
                 - bytes: Already in bytes format
 
         Returns:
-            bytes: Image in bytes format
+            bytes: Image in bytes format. Files are returned untouched, arrays
+            and PIL images are encoded with `encode_lossless`.
         """
         if isinstance(image_input, bytes):
             return image_input
 
         if isinstance(image_input, str):
             if os.path.isfile(image_input):
-                image_input = Image.open(image_input)
-                byte_arr = io.BytesIO()
-                image_input.save(byte_arr, format="PNG")
-                return byte_arr.getvalue()
+                # Send the file as-is, it is already encoded
+                with open(image_input, "rb") as f:
+                    return f.read()
             else:
                 try:
                     # Try if it's a base64 string
@@ -72,16 +140,14 @@ class ImageConverter:
                     )
 
         if isinstance(image_input, np.ndarray):
-            # Convert numpy array to PIL Image
-            image = Image.fromarray(image_input.astype("uint8"))
-            byte_arr = io.BytesIO()
-            image.save(byte_arr, format="PNG")
-            return byte_arr.getvalue()
+            # Convert numpy array to PIL Image, copying only if it isn't
+            # already a contiguous uint8 buffer
+            array = np.ascontiguousarray(image_input, dtype=np.uint8)
+            image = Image.fromarray(array)
+            return encode_lossless(image)
 
         if isinstance(image_input, Image.Image):
-            byte_arr = io.BytesIO()
-            image_input.save(byte_arr, format="PNG")
-            return byte_arr.getvalue()
+            return encode_lossless(image_input)
 
         raise ValueError(f"Unsupported input type: {type(image_input)}")
 
@@ -95,7 +161,8 @@ class ImageConverter:
             target_type (str): Desired output format ('PIL', 'numpy', 'tensor', or 'bytes')
 
         Returns:
-            Image in the specified format
+            Image in the specified format. numpy arrays are read-only views
+            over the decoded pixels, copy them before modifying them.
         """
         if target_type.lower() == "bytes":
             return image_bytes
@@ -107,7 +174,8 @@ class ImageConverter:
             return image
 
         if target_type.lower() == "numpy":
-            return np.array(image)
+            # Wrap the decoded pixels without copying them a second time
+            return np.asarray(image)
 
         raise ValueError(f"Unsupported target type: {target_type}")
 
@@ -127,6 +195,178 @@ class ImageConverter:
         return ImageConverter.from_bytes(image_bytes, target_type)
 
 
+# Bytes that change the parser state outside and inside JSON strings
+_JSON_STRUCTURE = re.compile(rb'[{}\[\],:"]')
+_JSON_STRING_SPECIAL = re.compile(rb'["\\]')
+# Escapes a JSON encoder may emit inside a base64 string: "/" can be escaped,
+# and line breaks come from encoders that wrap lines (e.g. base64.encodebytes)
+_B64_JSON_ESCAPES = {b"/": b"/", b"n": b"", b"r": b"", b"t": b""}
+
+
+def _decode_b64_prefix(pending):
+    # Decode the longest prefix made of whole 4-character base64 groups
+    usable = len(pending) - len(pending) % 4
+    return base64.b64decode(pending[:usable]), pending[usable:]
+
+
+def iter_b64_json_field(chunks, field):
+    """
+    Incrementally decode a base64 string member of a streamed JSON object.
+
+    Only members of the top-level object are considered, so a nested object
+    holding a key of the same name is skipped like `json.loads` would.
+
+    Args:
+        chunks: Iterable of bytes holding the raw JSON document
+        field (str): Name of the top-level member holding the base64 payload
+
+    Yields:
+        bytes: Decoded payload, chunk by chunk
+    """
+    chunks = iter(chunks)
+    field = field.encode()
+    buffer = b""
+    pos = 0
+    depth = 0
+    root_is_object = False
+    # Whether the next top-level string is a member name rather than a value
+    expect_name = False
+    name = None
+    in_string = False
+    string_kind = None  # "name", "value" or None for strings we skip
+    parts = []
+    pending = b""
+    while True:
+        need_data = False
+        if in_string:
+            match = _JSON_STRING_SPECIAL.search(buffer, pos)
+            end = match.start() if match else len(buffer)
+            if string_kind is not None:
+                parts.append(buffer[pos:end])
+            if match is None:
+                pos = end
+                need_data = True
+            elif buffer[end : end + 1] == b'"':
+                pos = end + 1
+                in_string = False
+                if string_kind == "name":
+                    name = b"".join(parts)
+                    parts = []
+                elif string_kind == "value":
+                    pending += b"".join(parts)
+                    if pending:
+                        yield base64.b64decode(pending)
+                    return
+            elif end + 1 == len(buffer):
+                # The escaped character is in the next chunk
+                pos = end
+                need_data = True
+            else:
+                escaped = buffer[end + 1 : end + 2]
+                if string_kind == "value":
+                    if escaped not in _B64_JSON_ESCAPES:
+                        raise ValueError(f"Invalid escape in base64 value: {escaped!r}")
+                    parts.append(_B64_JSON_ESCAPES[escaped])
+                elif string_kind == "name":
+                    # Keep escapes raw, an escaped name never equals the field
+                    parts.append(b"\\" + escaped)
+                pos = end + 2
+            if need_data and string_kind == "value":
+                # Decode what this chunk held before reading the next one
+                pending += b"".join(parts)
+                parts = []
+                block, pending = _decode_b64_prefix(pending)
+                if block:
+                    yield block
+        else:
+            match = _JSON_STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                need_data = True
+            else:
+                char = match.group()
+                pos = match.end()
+                top_level = depth == 1 and root_is_object
+                if char == b'"':
+                    in_string = True
+                    if top_level and expect_name:
+                        string_kind = "name"
+                    elif top_level and name == field:
+                        string_kind = "value"
+                    else:
+                        string_kind = None
+                elif char in (b"{", b"["):
+                    if depth == 0:
+                        root_is_object = char == b"{"
+                        expect_name = root_is_object
+                    depth += 1
+                elif char in (b"}", b"]"):
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif top_level and char == b",":
+                    expect_name = True
+                    name = None
+                elif top_level and char == b":":
+                    expect_name = False
+        if need_data:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            buffer = buffer[pos:] + chunk
+            pos = 0
+    if string_kind == "value":
+        raise ValueError(f"Truncated '{field.decode()}' value in response")
+    raise ValueError(f"Missing '{field.decode()}' key in response")
+
+
+def open_image(image_bytes):
+    """
+    Open encoded image bytes, keeping them on the image as `_original_bytes`.
+
+    Storing the image (e.g. to S3) can then reuse these bytes instead of
+    re-encoding it. Callers that modify the image in place must not rely on
+    them anymore.
+
+    Args:
+        image_bytes (bytes): Encoded image
+    Returns:
+        PIL.Image: Lazily decoded image
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    image._original_bytes = image_bytes
+    return image
+
+
+def image_from_response(response, chunk_size=64 * 1024):
+    """
+    Decode the image returned by a job server from a streamed response.
+
+    Args:
+        response: requests.Response opened with stream=True, or a read
+            httpx.Response. The image is either the raw body (image/* content
+            type) or a base64 string under the "result" key of a JSON body.
+        chunk_size (int): Number of bytes read from the socket at once
+
+    Returns:
+        PIL.Image: Decoded image
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if content_type.startswith("image/"):
+        # Pillow reads non-seekable streams into memory anyway, read it once
+        return open_image(response.content)
+
+    if hasattr(response, "iter_content"):
+        chunks = response.iter_content(chunk_size)
+    else:
+        chunks = response.iter_bytes(chunk_size)
+    image_bytes = b"".join(iter_b64_json_field(chunks, "result"))
+    # Drain the rest of the document so the connection can be reused
+    for _ in chunks:
+        pass
+    return open_image(image_bytes)
+
+
 class ServerTimeoutError(Exception):
     """Custom exception for timeout errors."""
 
@@ -136,3 +376,42 @@ class ServerTimeoutError(Exception):
 
     def __str__(self):
         return f"ServerTimeoutError: {self.message}"
+
+
+class ClientError(Exception):
+    """Custom exception for non-retryable (4xx) server responses."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+    def __str__(self):
+        return f"ClientError: {self.message}"
+
+
+class TransientServerError(Exception):
+    """Custom exception for retryable (429 and 5xx) server responses."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+    def __str__(self):
+        return f"TransientServerError: {self.message}"
+
+
+def backoff_delay(attempt, base=0.5, cap=30):
+    """
+    Compute an exponential backoff delay with full jitter.
+
+    Args:
+        attempt (int): Zero-based index of the attempt that just failed
+        base (float): Delay scale in seconds
+        cap (float): Upper bound of the delay in seconds
+
+    Returns:
+        float: Number of seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(cap, base * (2**attempt)))
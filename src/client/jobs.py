@@ -1,7 +1,21 @@
-import base64
 import json
 
-from .helpers import ImageConverter
+from .helpers import ImageConverter, guess_image_format, image_from_response
+
+
+def _image_file(name, image):
+    # Multipart file tuple, named and typed after the image's encoding
+    image_bytes = ImageConverter.to_bytes(image)
+    image_format = guess_image_format(image_bytes)
+    if image_format is None:
+        # Re-encode formats the server may not read (e.g. BMP, AVIF)
+        image_bytes = ImageConverter.to_bytes(ImageConverter.from_bytes(image_bytes))
+        image_format = guess_image_format(image_bytes)
+    return (f"{name}.{image_format}", image_bytes, f"image/{image_format}")
+
+
+# Every job returns a single image, decoded the same way
+process_outputs = image_from_response
 
 
 class FaceJob:
@@ -21,8 +35,7 @@ class FaceJob:
         generation_type = input_data.get("generation_type")
         prompt = input_data.get("prompt")
 
-        model_img = ImageConverter.to_bytes(model_img)
-        model_file = ("model.png", model_img, "image/png")
+        model_file = _image_file("model", model_img)
         files = {"model_img_buffer": model_file}
 
         # Format the input data
@@ -35,13 +48,7 @@ class FaceJob:
 
         return files, form_data
 
-    def process_outputs(response):
-        # Process the response
-        result_data = response.json()
-        result = result_data.get("result")
-        decoded_result = base64.b64decode(result)
-        result_img = ImageConverter.from_bytes(decoded_result)
-        return result_img
+    process_outputs = staticmethod(process_outputs)
 
 
 class MaskJob:
@@ -53,8 +60,7 @@ class MaskJob:
         model_img = input_data.get("model_img")
         category = input_data.get("category")
 
-        model_img = ImageConverter.to_bytes(model_img)
-        model_file = ("model.png", model_img, "image/png")
+        model_file = _image_file("model", model_img)
         files = {"model_img_buffer": model_file}
 
         # Format the input data
@@ -65,13 +71,7 @@ class MaskJob:
 
         return files, form_data
 
-    def process_outputs(response):
-        # Process the response
-        result_data = response.json()
-        result = result_data.get("result")
-        decoded_result = base64.b64decode(result)
-        result_img = ImageConverter.from_bytes(decoded_result)
-        return result_img
+    process_outputs = staticmethod(process_outputs)
 
 
 class TryOnJob:
@@ -87,13 +87,12 @@ class TryOnJob:
         mask_img = input_data.get("mask_img")
         category = input_data.get("category")
 
-        model_img = ImageConverter.to_bytes(model_img)
-        model_file = ("model.png", model_img, "image/png")
-        cloth_img = ImageConverter.to_bytes(cloth_img)
-        cloth_file = ("cloth.png", cloth_img, "image/png")
+        model_file = _image_file("model", model_img)
+        cloth_file = _image_file("cloth", cloth_img)
         if mask_img is not None:
-            mask_img = ImageConverter.to_bytes(mask_img)
-        mask_file = ("mask.png", mask_img, "image/png")
+            mask_file = _image_file("mask", mask_img)
+        else:
+            mask_file = ("mask.png", None, "image/png")
         files = {
             "model_img_buffer": model_file,
             "cloth_img_buffer": cloth_file,
@@ -108,13 +107,7 @@ class TryOnJob:
 
         return files, form_data
 
-    def process_outputs(response):
-        # Process the response
-        result_data = response.json()
-        result = result_data.get("result")
-        decoded_result = base64.b64decode(result)
-        result_img = ImageConverter.from_bytes(decoded_result)
-        return result_img
+    process_outputs = staticmethod(process_outputs)
 
 
 class HandsFixJob:
@@ -123,8 +116,7 @@ class HandsFixJob:
         assert "model_img" in input_data, "Missing 'model_img' key in input_data"
 
         model_img = input_data.get("model_img")
-        model_img = ImageConverter.to_bytes(model_img)
-        model_file = ("model.png", model_img, "image/png")
+        model_file = _image_file("model", model_img)
         files = {
             "model_img_buffer": model_file,
         }
@@ -132,13 +124,7 @@ class HandsFixJob:
 
         return files, form_data
 
-    def process_outputs(response):
-        # Process the response
-        result_data = response.json()
-        result = result_data.get("result")
-        decoded_result = base64.b64decode(result)
-        result_img = ImageConverter.from_bytes(decoded_result)
-        return result_img
+    process_outputs = staticmethod(process_outputs)
 
 
 class RetouchJob:
@@ -147,8 +133,7 @@ class RetouchJob:
         assert "model_img" in input_data, "Missing 'model_img' key in input_data"
 
         model_img = input_data.get("model_img")
-        model_img = ImageConverter.to_bytes(model_img)
-        model_file = ("model.png", model_img, "image/png")
+        model_file = _image_file("model", model_img)
         files = {
             "model_img_buffer": model_file,
         }
@@ -159,13 +144,7 @@ class RetouchJob:
 
         return files, form_data
 
-    def process_outputs(response):
-        # Process the response
-        result_data = response.json()
-        result = result_data.get("result")
-        decoded_result = base64.b64decode(result)
-        result_img = ImageConverter.from_bytes(decoded_result)
-        return result_img
+    process_outputs = staticmethod(process_outputs)
 
 
 class ModelGenerationJob:
@@ -185,10 +164,4 @@ class ModelGenerationJob:
 
         return files, form_data
 
-    def process_outputs(response):
-        # Process the response
-        result_data = response.json()
-        result = result_data.get("result")
-        decoded_result = base64.b64decode(result)
-        result_img = ImageConverter.from_bytes(decoded_result)
-        return result_img
+    process_outputs = staticmethod(process_outputs)
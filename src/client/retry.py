@@ -0,0 +1,152 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import httpx
+import requests
+from loguru import logger
+
+from .circuit_breaker import CircuitBreaker
+from .helpers import (
+    ClientError,
+    ServerTimeoutError,
+    TransientServerError,
+    backoff_delay,
+)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_EXCEPTIONS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    # Raised by streamed bodies when the connection drops mid-transfer
+    requests.exceptions.ChunkedEncodingError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+    TransientServerError,
+)
+
+# One circuit breaker per backend, shared by every client targeting it
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(server_url):
+    with _breakers_lock:
+        if server_url not in _breakers:
+            _breakers[server_url] = CircuitBreaker(server_url)
+        return _breakers[server_url]
+
+
+def should_retry(exc_or_response):
+    """
+    Tell whether a failed attempt is worth retrying.
+    Only timeouts, connection errors and throttling/5xx responses are transient.
+    """
+    if isinstance(exc_or_response, (requests.Response, httpx.Response)):
+        return exc_or_response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc_or_response, RETRYABLE_EXCEPTIONS)
+
+
+def check_response(response):
+    # Check response status
+    if response.status_code != 200:
+        # Try to parse response as JSON
+        try:
+            error_data = response.json()
+            logger.error("\nError: {}", error_data.get("error", "Unknown error"))
+
+            # Print the stack trace if available
+            if "stack_trace" in error_data:
+                logger.error("\n--- Server Stack Trace ---")
+                logger.error(error_data["stack_trace"])
+        except:
+            # If not JSON, print raw response
+            logger.error("\nRaw server response: {}", response.text)
+
+        message = f"Server returned status code {response.status_code}"
+        if should_retry(response):
+            raise TransientServerError(message, status_code=response.status_code)
+        raise ClientError(message, status_code=response.status_code)
+
+
+class JobAttempts:
+    """
+    Retry policy of a single `run_job` call, shared by the sync and async clients.
+
+    It owns the end-to-end deadline, the backend's circuit breaker and the
+    attempt counter, so the clients only have to send the request and sleep.
+    """
+
+    def __init__(self, client, retry):
+        self.server_url = client.server_url
+        self.max_timeout = client.max_timeout
+        self.connect_timeout = client.connect_timeout
+        self.read_timeout = client.read_timeout
+        self.retry = retry
+        self.start = time.time()
+        self.deadline = time.monotonic() + client.max_timeout
+        self.breaker = get_breaker(client.server_url)
+        self.attempt = 0
+
+    @contextmanager
+    def send(self):
+        """
+        Guard one attempt, from sending the request to decoding its response.
+
+        Yields:
+            tuple: (connect_timeout, read_timeout) left for this attempt
+
+        Raises:
+            ServerTimeoutError: If the job's deadline is exceeded
+            CircuitOpenError: If the backend's circuit rejects the call
+        """
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise ServerTimeoutError(f"Job exceeded its {self.max_timeout}s deadline")
+
+        # Fail fast while the backend is known to be down
+        self.breaker.before()
+
+        logger.info("Sending request... Attempt {}", self.attempt + 1)
+        try:
+            yield (
+                min(self.connect_timeout, remaining),
+                min(self.read_timeout, remaining),
+            )
+        except Exception as e:
+            # Only transient errors count against the backend's health
+            self.breaker.record(success=not should_retry(e))
+            raise
+        except BaseException:
+            # Cancelled or interrupted, the backend's health is unknown
+            self.breaker.release()
+            raise
+        self.breaker.record(success=True)
+
+    def succeeded(self):
+        logger.opt(lazy=True).info(
+            "Time taken to run the job: {}", lambda: time.time() - self.start
+        )
+
+    def failed(self, error):
+        """
+        Record a failed attempt.
+
+        Args:
+            error (Exception): Error raised by the attempt
+
+        Returns:
+            float or None: Seconds to wait before the next attempt, or None if
+            the error must be raised
+        """
+        logger.error("Attempt {} failed: {}", self.attempt + 1, error)
+        if not should_retry(error):
+            return None
+        self.attempt += 1
+        if self.attempt >= self.retry:
+            logger.error("All retry attempts failed.")
+            return None
+        logger.info("Retrying...")
+        remaining = max(0, self.deadline - time.monotonic())
+        return min(backoff_delay(self.attempt - 1), remaining)
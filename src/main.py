@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 import yaml
 from PIL import Image
@@ -7,7 +8,7 @@ from prefect.logging import get_logger
 from prefect_aws import AwsCredentials
 
 from client import DummyJobClient
-from s3 import download_image, upload_image
+from s3 import download_image, upload_bytes, upload_image
 
 aws_credentials_block = AwsCredentials.load("aws-credentials")
 assert isinstance(aws_credentials_block, AwsCredentials)
@@ -24,6 +25,16 @@ os.environ["AWS_SESSION_TOKEN"] = AWS_SESSION_TOKEN
 
 logger = get_logger("dummy-try-on-workflow")
 
+# libyaml's C loader is much faster than the pure-Python one, when available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=16)
+def _load_config(config_path: str, mtime: float) -> dict:
+    # The modification time is part of the cache key so edits are picked up
+    with open(config_path, "r") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
 
 @task(
     description="Pull a garment image from S3",
@@ -34,9 +45,9 @@ logger = get_logger("dummy-try-on-workflow")
 def pull_garment_image(garment_uri: str) -> Image.Image:
     image, status = download_image(garment_uri)
     if status == "fail" or image is None:
-        logger.error(f"Failed to download garment image from {garment_uri}")
+        logger.error("Failed to download garment image from %s", garment_uri)
         raise ValueError("Failed to download garment image")
-    logger.info(f"Downloaded garment image from {garment_uri}")
+    logger.info("Downloaded garment image from %s", garment_uri)
     return image
 
 
@@ -113,11 +124,18 @@ def generate_tryon(
     retry_delay_seconds=10,
 )
 def push_tryon_to_s3(tryon_image: Image.Image, output_uri: str):
-    uri, status = upload_image(tryon_image, output_uri)
+    # Upload the bytes returned by the try-on job as-is when they are known,
+    # instead of re-encoding the image
+    original_bytes = getattr(tryon_image, "_original_bytes", None)
+    if original_bytes is not None and tryon_image.format is not None:
+        content_type = Image.MIME.get(tryon_image.format, "application/octet-stream")
+        uri, status = upload_bytes(original_bytes, output_uri, content_type)
+    else:
+        uri, status = upload_image(tryon_image, output_uri)
     if status == "fail":
         logger.error("Failed to upload try-on image")
         raise ValueError("Failed to upload try-on image")
-    logger.info(f"Uploaded try-on image to {output_uri}")
+    logger.info("Uploaded try-on image to %s", output_uri)
     return uri
 
 
@@ -135,27 +153,27 @@ def main_flow(
     output_uri: str,
     config_path: str,
 ):
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    config = _load_config(config_path, os.path.getmtime(config_path))
 
     # Parallel execution of garment image pull and model generation
     future_garment_image = pull_garment_image.submit(garment_uri)
     future_model_image = generate_model.submit(
         config["endpoints"]["model_generator"], model_prompt
     )
-    garment_image = future_garment_image.result()
-    model_image = future_model_image.result()
 
-    # Sequential execution of mask generation and try-on generation
-    mask_image = generate_mask(config["endpoints"]["masking"], model_image, category)
-    tryon_image = generate_tryon(
+    # Futures are passed on so each task starts as soon as its own inputs are
+    # ready: the mask only waits for the model, not for the garment pull
+    future_mask_image = generate_mask.submit(
+        config["endpoints"]["masking"], future_model_image, category
+    )
+    future_tryon_image = generate_tryon.submit(
         config["endpoints"]["tryon"],
-        model_image,
-        mask_image,
-        garment_image,
+        future_model_image,
+        future_mask_image,
+        future_garment_image,
         category,
     )
-    push_tryon_to_s3(tryon_image, output_uri)
+    push_tryon_to_s3(future_tryon_image, output_uri)
 
 
 # if __name__ == "__main__":
@@ -1,15 +1,48 @@
 import os
+import threading
 from enum import Enum
+from functools import lru_cache
 from io import BytesIO
 from typing import Literal, Optional, TypeVar
 from urllib.parse import urlparse
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from PIL import Image
 from prefect.logging import get_logger
 
 logger = get_logger("s3")
 
+_s3_client = None
+_s3_client_lock = threading.Lock()
+_S3_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+# Objects above 8 MiB are transferred as parts fetched/sent in parallel
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
+def _get_s3_client():
+    """
+    Return a process-wide S3 client, built on first use.
+    Building a client loads the service model and opens a new connection pool,
+    so it is shared across calls instead of being rebuilt each time.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client("s3", config=_S3_CLIENT_CONFIG)
+    return _s3_client
+
 
 class ExtensionsEnum(Enum):
     WEBP = ".webp"
@@ -24,26 +57,15 @@ class ExtensionsEnum(Enum):
 
     @staticmethod
     def str_to_extension(extension):
-        if extension.lower() == "webp":
-            return ExtensionsEnum.WEBP
-        elif extension.lower() == "png":
-            return ExtensionsEnum.PNG
-        elif extension.lower() == "jpg":
-            return ExtensionsEnum.JPG
-        elif extension.lower() == "jpeg":
-            return ExtensionsEnum.JPEG
-        elif extension.lower() == "tiff":
-            return ExtensionsEnum.TIFF
-        elif extension.lower() == "blosc2":
-            return ExtensionsEnum.BLOSC2
-        elif extension.lower() == "txt":
-            return ExtensionsEnum.TXT
-        elif extension.lower() == "json":
-            return ExtensionsEnum.JSON
-        elif extension.lower() == "csv":
-            return ExtensionsEnum.CSV
-        else:
-            raise ValueError(f"Invalid extension: {extension}")
+        try:
+            return _EXTENSIONS_BY_NAME[extension.lower()]
+        except KeyError:
+            raise ValueError(f"Invalid extension: {extension}") from None
+
+
+# Lookup tables built once, kept outside the class so they don't become members
+_EXTENSIONS_BY_NAME = {e.name.lower(): e for e in ExtensionsEnum}
+_EXTENSION_VALUES = frozenset(e.value for e in ExtensionsEnum)
 
 
 extension_type = TypeVar(
@@ -58,6 +80,22 @@ extension_type = TypeVar(
 )
 
 
+@lru_cache(maxsize=1024)
+def _parse_s3(uri: str) -> tuple[str, str]:
+    """
+    Split an S3 uri into its bucket name and object key.
+    Args:
+        uri: S3 object uri
+    Returns:
+        Tuple of (bucket_name, key)
+    """
+    parsed_uri = urlparse(uri)
+    # Validate S3 URI format
+    if parsed_uri.scheme != "s3":
+        raise ValueError(f"Invalid S3 URI: {uri}")
+    return parsed_uri.netloc, parsed_uri.path.lstrip("/")
+
+
 def download_file(
     uri: str, output_folder: str, s3_client=None, new_name: Optional[str] = None
 ) -> tuple[str, str]:
@@ -69,30 +107,25 @@ def download_file(
         Tuple of (local_path, status)
         status: "skipped" if file already exists, "success" if file was downloaded, "fail" if error occurred
     """
-    parsed_uri = urlparse(uri)
-    # Validate S3 URI format
-    if parsed_uri.scheme != "s3":
-        raise ValueError(f"Invalid S3 URI: {uri}")
+    bucket_name, key = _parse_s3(uri)
     # Create output folder if it doesn't exist
     os.makedirs(output_folder, exist_ok=True)
     if new_name is not None:
-        extension = os.path.splitext(os.path.basename(parsed_uri.path))[1]
+        extension = os.path.splitext(os.path.basename(key))[1]
         local_path = os.path.join(output_folder, new_name + extension)
     else:
-        local_path = os.path.join(output_folder, os.path.basename(parsed_uri.path))
+        local_path = os.path.join(output_folder, os.path.basename(key))
     # Check if file already exists
     if os.path.exists(local_path):
         return local_path, "skipped"
-    # Create S3 client if not provided
-    if s3_client is None:
-        s3_client = boto3.client("s3")
+    # Use the shared S3 client if none is provided
+    s3_client = s3_client or _get_s3_client()
     try:
-        bucket_name = parsed_uri.netloc
-        key = parsed_uri.path.lstrip("/")
         s3_client.download_file(
             bucket_name,
             key,
             local_path,
+            Config=_TRANSFER_CONFIG,
         )
         return local_path, "success"
 
@@ -111,20 +144,15 @@ def upload_file(local_path: str, s3_uri: str, s3_client=None) -> tuple[str, str]
         Tuple of (s3_uri, status)
         status: "skipped" if file already exists, "success" if file was uploaded, "fail" if error occurred
     """
-    parsed_uri = urlparse(s3_uri)
-    # Validate S3 URI format
-    if parsed_uri.scheme != "s3":
-        raise ValueError(f"Invalid S3 URI: {s3_uri}")
-    # Create S3 client if not provided
-    if s3_client is None:
-        s3_client = boto3.client("s3")
+    bucket_name, key = _parse_s3(s3_uri)
+    # Use the shared S3 client if none is provided
+    s3_client = s3_client or _get_s3_client()
     try:
-        bucket_name = parsed_uri.netloc
-        key = parsed_uri.path.lstrip("/")
         s3_client.upload_file(
             local_path,
             bucket_name,
             key,
+            Config=_TRANSFER_CONFIG,
         )
         return s3_uri, "success"
     except Exception as e:
@@ -141,27 +169,22 @@ def download_image(uri: str, s3_client=None) -> tuple[Optional[Image.Image], str
         Tuple of (Image object, status)
         status: "skipped" if image already exists, "success" if image was downloaded and is valid, "fail" if error occurred
     """
-    parsed_uri = urlparse(uri)
-    # Validate S3 URI format
-    if parsed_uri.scheme != "s3":
-        raise ValueError(f"Invalid S3 URI: {uri}")
-    # Create S3 client if not provided
-    if s3_client is None:
-        s3_client = boto3.client("s3")
+    bucket_name, key = _parse_s3(uri)
+    # Use the shared S3 client if none is provided
+    s3_client = s3_client or _get_s3_client()
     try:
-        bucket_name = parsed_uri.netloc
-        key = parsed_uri.path.lstrip("/")
         # Check if the extension is valid
         extension = os.path.splitext(key)[1].lower()
-        if extension not in [e.value for e in ExtensionsEnum]:
+        if extension not in _EXTENSION_VALUES:
             raise ValueError(f"Invalid file extension: {extension}")
         # Download the file into a buffer
         buffer = BytesIO()
-        s3_client.download_fileobj(bucket_name, key, buffer)
+        s3_client.download_fileobj(bucket_name, key, buffer, Config=_TRANSFER_CONFIG)
         buffer.seek(0)
-        # Verify the image
+        # Decode the image, this raises if it is not valid and, unlike
+        # verify(), leaves it usable without reparsing the buffer
         image = Image.open(buffer)
-        image.verify()  # This will raise an exception if the image is not valid
+        image.load()
         return image, "success"
     except Exception as e:
         logger.error(f"Error downloading {uri}: {e}")
@@ -178,28 +201,50 @@ def upload_image(image: Image.Image, s3_uri: str, s3_client=None) -> tuple[str,
         Tuple of (s3_uri, status)
         status: "success" if image was uploaded, "fail" if error occurred
     """
-    parsed_uri = urlparse(s3_uri)
-    # Validate S3 URI format
-    if parsed_uri.scheme != "s3":
-        raise ValueError(f"Invalid S3 URI: {s3_uri}")
-    # Create S3 client if not provided
-    if s3_client is None:
-        s3_client = boto3.client("s3")
+    bucket_name, key = _parse_s3(s3_uri)
+    # Use the shared S3 client if none is provided
+    s3_client = s3_client or _get_s3_client()
     try:
-        bucket_name = parsed_uri.netloc
-        key = parsed_uri.path.lstrip("/")
         # Check if the image format is valid
-        if image.format is None or f".{image.format.lower()}" not in [
-            e.value for e in ExtensionsEnum
-        ]:
+        if image.format is None or f".{image.format.lower()}" not in _EXTENSION_VALUES:
             raise ValueError(f"Invalid image format: {image.format}")
         # Save the image to a buffer
         buffer = BytesIO()
         image.save(buffer, format=image.format)
         buffer.seek(0)
         # Upload the buffer to S3
-        s3_client.upload_fileobj(buffer, bucket_name, key)
+        s3_client.upload_fileobj(buffer, bucket_name, key, Config=_TRANSFER_CONFIG)
         return s3_uri, "success"
     except Exception as e:
         logger.error(f"Error uploading image to {s3_uri}: {e}")
         return s3_uri, "fail"
+
+
+def upload_bytes(
+    data: bytes, s3_uri: str, content_type: str, s3_client=None
+) -> tuple[str, str]:
+    """
+    Upload already encoded bytes to S3, without decoding or re-encoding them.
+    Args:
+        data: Encoded file content
+        s3_uri: S3 object uri
+        content_type: MIME type stored with the object
+    Returns:
+        Tuple of (s3_uri, status)
+        status: "success" if data was uploaded, "fail" if error occurred
+    """
+    bucket_name, key = _parse_s3(s3_uri)
+    # Use the shared S3 client if none is provided
+    s3_client = s3_client or _get_s3_client()
+    try:
+        s3_client.upload_fileobj(
+            BytesIO(data),
+            bucket_name,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=_TRANSFER_CONFIG,
+        )
+        return s3_uri, "success"
+    except Exception as e:
+        logger.error(f"Error uploading data to {s3_uri}: {e}")
+        return s3_uri, "fail"